@@ -0,0 +1,65 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+class MockApiFootballServer:
+    """
+    Local HTTP server serving canned API-Football responses and counting requests
+    """
+
+    def __init__(self, fixture_responses):
+        self.fixture_responses = fixture_responses
+        self.round_trips = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with mock.lock:
+                    mock.round_trips += 1
+
+                parsed = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+                body = json.dumps(mock.respond(parsed.path.strip("/"), params)).encode()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                # Keep make_api_request from backing off for rate limits
+                self.send_header("x-ratelimit-remaining", "1000000")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def respond(self, endpoint, params):
+        """
+        Build the response body for an endpoint and query parameters
+        """
+        if endpoint == "fixtures":
+            key = (int(params.get("league", 0)), params.get("season"))
+            if key in self.fixture_responses:
+                return self.fixture_responses[key]
+        return {"results": 0, "response": []}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
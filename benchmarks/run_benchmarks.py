@@ -0,0 +1,292 @@
+"""
+Benchmark the per-fixture hot paths of the data collection pipeline
+
+Runs fetch_and_store_fixtures, calculate_tactical_matchups,
+create_enhanced_matches and make_predictions against synthetic data, a local
+mock API-Football server and an in-memory mock of the Supabase client, so it
+needs no network access or credentials. Each stage must produce the expected
+number of output rows, and reports wall time, API and storage round-trips and
+peak traced memory, which are compared against the stored baselines.
+
+Round-trip counts are deterministic and must match the baseline exactly, and
+peak memory must stay within its tolerance; either failing exits non-zero.
+Wall time depends on the machine, so slower stages are only reported as
+warnings, and time baselines must be re-recorded on each machine.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --leagues 5 --seasons 3
+    python -m benchmarks.run_benchmarks --update-baselines
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+import data_collection
+from benchmarks.mock_backends import MockApiFootballServer
+from benchmarks.synthetic_data import generate_dataset
+from mock_supabase import MockStorage
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+def load_model(state):
+    """
+    Load the prediction model once, outside the timed prediction loop
+    """
+    state["model"], state["scaler"] = data_collection.load_prediction_model()
+
+def make_predictions(state):
+    """
+    Run make_predictions' per-fixture loop with the preloaded model
+
+    Unlike make_predictions this lets errors propagate, so a broken stage
+    fails the run.
+    """
+    upcoming_fixtures = data_collection.supabase.table("fixtures").select("*").eq("status", "NS").execute().data
+
+    for fixture in upcoming_fixtures:
+        data_collection.make_prediction(fixture, state["model"], state["scaler"])
+
+STAGES = [
+    ("fetch_and_store_fixtures", lambda state: data_collection.fetch_and_store_fixtures()),
+    ("calculate_tactical_matchups", lambda state: data_collection.calculate_tactical_matchups()),
+    ("create_enhanced_matches", lambda state: data_collection.create_enhanced_matches()),
+    ("load_prediction_model", load_model),
+    ("make_predictions", make_predictions)
+]
+
+# Table each stage writes to, checked after the stage so a stage that fails
+# early is reported as broken rather than as faster
+STAGE_OUTPUTS = {
+    "fetch_and_store_fixtures": "fixtures",
+    "calculate_tactical_matchups": "tactical_matchups",
+    "create_enhanced_matches": "enhanced_matches",
+    "make_predictions": "predictions"
+}
+
+# Round-trip counts are deterministic, so any difference from the baseline is a regression
+EXACT_METRICS = ["api_round_trips", "storage_round_trips"]
+
+# Metrics that are only reported as warnings when they exceed their limit
+WARNING_METRICS = ["seconds"]
+
+# Allowed relative increase over the baseline before a metric is flagged
+TOLERANCES = {
+    "seconds": 0.5,
+    "peak_memory_mb": 0.25
+}
+
+# Absolute slack added on top of the relative tolerance, so stages that only
+# take a few milliseconds are not flagged for scheduler noise
+SLACK = {
+    "seconds": 0.05,
+    "peak_memory_mb": 0.5
+}
+
+def expected_row_counts(tables, fixture_responses):
+    """
+    Get the number of rows each output table should hold once its stage has run
+    """
+    current_fixtures = [fixture for response in fixture_responses.values() for fixture in response["response"]]
+    total_fixtures = len(tables["fixtures"]) + len(current_fixtures)
+    upcoming_fixtures = sum(1 for fixture in current_fixtures if fixture["fixture"]["status"]["short"] == "NS")
+
+    return {
+        "fixtures": total_fixtures,
+        "tactical_matchups": total_fixtures,
+        "enhanced_matches": total_fixtures,
+        "predictions": upcoming_fixtures
+    }
+
+def run_stages(tables, fixture_responses, trace_memory):
+    """
+    Run every stage in order against fresh mock backends and collect metrics
+
+    Raises RuntimeError if a stage does not produce the expected output rows.
+    """
+    expected_rows = expected_row_counts(tables, fixture_responses)
+    storage = MockStorage(tables)
+    server = MockApiFootballServer(fixture_responses).start()
+    original_supabase = data_collection.supabase
+    original_url = data_collection.API_FOOTBALL_URL
+    data_collection.supabase = storage
+    data_collection.API_FOOTBALL_URL = server.url
+    results = {}
+    state = {}
+
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+
+            for stage_name, stage in STAGES:
+                storage_before = storage.round_trips
+                api_before = server.round_trips
+
+                if trace_memory:
+                    tracemalloc.start()
+                start_time = time.perf_counter()
+                stage(state)
+                seconds = time.perf_counter() - start_time
+                if trace_memory:
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                results[stage_name] = {
+                    "seconds": seconds,
+                    "api_round_trips": server.round_trips - api_before,
+                    "storage_round_trips": storage.round_trips - storage_before
+                }
+                if trace_memory:
+                    results[stage_name]["peak_memory_mb"] = peak / (1024 * 1024)
+
+                output_table = STAGE_OUTPUTS.get(stage_name)
+                if output_table is None:
+                    continue
+                output_rows = len(storage.tables.get(output_table, []))
+                if output_rows != expected_rows[output_table]:
+                    raise RuntimeError(f"{stage_name} produced {output_rows} {output_table} rows, expected {expected_rows[output_table]}")
+    finally:
+        data_collection.supabase = original_supabase
+        data_collection.API_FOOTBALL_URL = original_url
+        server.stop()
+
+    return results
+
+def run_benchmarks(num_leagues, num_seasons, teams_per_league):
+    """
+    Run the benchmark suite for a given scale and return metrics per stage
+    """
+    tables, fixture_responses = generate_dataset(num_leagues, num_seasons, teams_per_league)
+
+    # Timing and memory are measured in separate passes, as tracing
+    # allocations slows down the code being timed
+    results = run_stages(tables, fixture_responses, trace_memory=False)
+    memory_results = run_stages(tables, fixture_responses, trace_memory=True)
+
+    for stage_name, metrics in memory_results.items():
+        results[stage_name]["peak_memory_mb"] = metrics["peak_memory_mb"]
+
+    return results
+
+def compare_with_baselines(results, baselines):
+    """
+    Compare results against baselines and return regression messages and slower-than-baseline messages
+    """
+    regressions = []
+    slow_metrics = []
+
+    for stage_name, metrics in results.items():
+        baseline = baselines.get(stage_name)
+        if baseline is None:
+            continue
+
+        for metric, value in metrics.items():
+            if metric not in baseline:
+                continue
+            if metric in EXACT_METRICS:
+                if value != baseline[metric]:
+                    regressions.append(f"{stage_name}.{metric}: {value} != baseline {baseline[metric]}")
+                continue
+            limit = baseline[metric] * (1 + TOLERANCES[metric]) + SLACK[metric]
+            if value > limit:
+                message = f"{stage_name}.{metric}: {value:.3f} > baseline {baseline[metric]:.3f} (limit {limit:.3f})"
+                if metric in WARNING_METRICS:
+                    slow_metrics.append(message)
+                else:
+                    regressions.append(message)
+
+    return regressions, slow_metrics
+
+def print_results(results, baselines):
+    """
+    Print a table of results alongside their baselines
+    """
+    print(f"{'stage':<30}{'seconds':>12}{'api calls':>12}{'db calls':>12}{'peak MB':>12}")
+
+    for stage_name, metrics in results.items():
+        print(
+            f"{stage_name:<30}"
+            f"{metrics['seconds']:>12.3f}"
+            f"{metrics['api_round_trips']:>12}"
+            f"{metrics['storage_round_trips']:>12}"
+            f"{metrics['peak_memory_mb']:>12.2f}"
+        )
+
+        baseline = baselines.get(stage_name)
+        if baseline:
+            print(
+                f"{'  baseline':<30}"
+                f"{baseline['seconds']:>12.3f}"
+                f"{baseline['api_round_trips']:>12}"
+                f"{baseline['storage_round_trips']:>12}"
+                f"{baseline['peak_memory_mb']:>12.2f}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data collection pipeline's hot paths")
+    parser.add_argument("--leagues", type=int, default=2, help="number of synthetic leagues")
+    parser.add_argument("--seasons", type=int, default=2, help="number of synthetic seasons per league")
+    parser.add_argument("--teams", type=int, default=20, help="number of teams per league")
+    parser.add_argument("--baselines", default=BASELINES_PATH, help="path to the baselines JSON file")
+    parser.add_argument("--update-baselines", action="store_true", help="store these results as the new baselines")
+    args = parser.parse_args()
+
+    if args.leagues < 1 or args.seasons < 1:
+        parser.error("--leagues and --seasons must be at least 1")
+    if args.teams < 2:
+        parser.error("--teams must be at least 2")
+
+    # load_prediction_model reads the model and scaler from the working directory
+    os.chdir(REPO_ROOT)
+
+    scale = f"{args.leagues}x{args.seasons}x{args.teams}"
+    print(f"Running benchmarks for {args.leagues} leagues x {args.seasons} seasons x {args.teams} teams...")
+    try:
+        results = run_benchmarks(args.leagues, args.seasons, args.teams)
+    except Exception as e:
+        print(f"Benchmark failed: {e}")
+        return 1
+
+    all_baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            all_baselines = json.load(f)
+    baselines = all_baselines.get(scale, {})
+
+    print_results(results, baselines)
+
+    if args.update_baselines:
+        all_baselines[scale] = results
+        with open(args.baselines, "w") as f:
+            json.dump(all_baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Updated baselines for scale {scale}")
+        return 0
+
+    if not baselines:
+        print(f"No baselines stored for scale {scale}, run with --update-baselines to record them")
+        return 0
+
+    regressions, slow_metrics = compare_with_baselines(results, baselines)
+    if slow_metrics:
+        print("Slower than baseline (timings are machine-specific, re-record baselines on each machine):")
+        for message in slow_metrics:
+            print(f"  {message}")
+
+    if regressions:
+        print("Regressions detected:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("No regressions detected")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
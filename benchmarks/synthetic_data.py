@@ -0,0 +1,155 @@
+import random
+from datetime import datetime, timedelta
+
+from data_collection import CURRENT_SEASON
+
+TACTICAL_FIELDS = [
+    "pressing_intensity",
+    "possession_control",
+    "counter_attack_focus",
+    "defensive_line_height",
+    "defensive_aggression",
+    "defensive_width",
+    "offensive_width",
+    "offensive_depth",
+    "buildup_speed",
+    "buildup_passing_directness",
+    "buildup_initiation",
+    "chance_creation_method",
+    "defensive_organization",
+    "wing_play_emphasis"
+]
+
+# Statuses treated as finished by create_enhanced_match
+FINISHED_STATUS = "FT"
+UPCOMING_STATUS = "NS"
+
+def season_names(num_seasons):
+    """
+    Get season names ending with CURRENT_SEASON, oldest first
+    """
+    start_year = int(CURRENT_SEASON.split("-")[0])
+    return [f"{year}-{year + 1}" for year in range(start_year - num_seasons + 1, start_year + 1)]
+
+def generate_fixture(home_team, away_team, match_date, finished, rng):
+    """
+    Generate a single fixture in API-Football response format
+    """
+    return {
+        "fixture": {
+            "id": None,
+            "date": match_date.isoformat(),
+            "status": {"short": FINISHED_STATUS if finished else UPCOMING_STATUS}
+        },
+        "teams": {
+            "home": {"id": home_team["api_id"], "name": home_team["name"]},
+            "away": {"id": away_team["api_id"], "name": away_team["name"]}
+        },
+        "goals": {
+            "home": rng.randint(0, 4) if finished else None,
+            "away": rng.randint(0, 4) if finished else None
+        }
+    }
+
+def generate_dataset(num_leagues, num_seasons, teams_per_league=20, seed=0):
+    """
+    Generate a synthetic dataset for num_leagues leagues over num_seasons seasons
+
+    Returns the rows to seed into storage, keyed by table name, and the
+    API-Football "fixtures" responses for the current season, keyed by
+    (league api_id, season). Past seasons are seeded directly into storage as
+    finished fixtures; the current season is half played and is only
+    available through the API.
+    """
+    rng = random.Random(seed)
+    seasons = season_names(num_seasons)
+    tables = {
+        "leagues": [],
+        "teams": [],
+        "managers": [],
+        "tactical_vectors": [],
+        "team_stats": [],
+        "fixtures": []
+    }
+    fixture_responses = {}
+    fixture_api_id = 1
+
+    for league_index in range(num_leagues):
+        league = {
+            "id": league_index + 1,
+            "name": f"League {league_index + 1}",
+            "country": f"Country {league_index + 1}",
+            "api_id": 1000 + league_index
+        }
+        tables["leagues"].append(league)
+
+        teams = []
+        for team_index in range(teams_per_league):
+            team_id = league_index * teams_per_league + team_index + 1
+            team = {
+                "id": team_id,
+                "name": f"Team {league_index + 1}-{team_index + 1}",
+                "league_id": league["id"],
+                "api_id": 100000 + team_id,
+                "logo_url": None
+            }
+            teams.append(team)
+            tables["teams"].append(team)
+
+            tables["managers"].append({
+                "id": team_id,
+                "name": f"Manager {league_index + 1}-{team_index + 1}",
+                "team_id": team_id,
+                "api_id": 200000 + team_id
+            })
+
+            vector = {"id": team_id, "manager_id": team_id}
+            vector.update({field: rng.uniform(0.0, 1.0) for field in TACTICAL_FIELDS})
+            tables["tactical_vectors"].append(vector)
+
+            tables["team_stats"].append({
+                "id": team_id,
+                "team_id": team_id,
+                "season": CURRENT_SEASON,
+                "elo_rating": rng.uniform(1300.0, 1900.0),
+                "goals_scored": rng.randint(10, 90),
+                "goals_conceded": rng.randint(10, 90),
+                "points_per_game": rng.uniform(0.5, 2.5)
+            })
+
+        for season in seasons:
+            # Double round robin, with the second half of the current season unplayed
+            pairings = [(home, away) for home in teams for away in teams if home is not away]
+            season_start = datetime(int(season.split("-")[0]), 8, 1)
+            played = len(pairings) if season != CURRENT_SEASON else len(pairings) // 2
+            responses = []
+
+            for index, (home, away) in enumerate(pairings):
+                match_date = season_start + timedelta(days=index // max(1, teams_per_league // 2))
+                fixture = generate_fixture(home, away, match_date, index < played, rng)
+                fixture["fixture"]["id"] = fixture_api_id
+                fixture_api_id += 1
+
+                if season == CURRENT_SEASON:
+                    responses.append(fixture)
+                else:
+                    tables["fixtures"].append({
+                        "id": len(tables["fixtures"]) + 1,
+                        "home_team_id": home["id"],
+                        "away_team_id": away["id"],
+                        "league_id": league["id"],
+                        "season": season,
+                        "match_date": fixture["fixture"]["date"],
+                        "home_score": fixture["goals"]["home"],
+                        "away_score": fixture["goals"]["away"],
+                        "status": fixture["fixture"]["status"]["short"],
+                        "api_id": fixture["fixture"]["id"]
+                    })
+
+            if season == CURRENT_SEASON:
+                fixture_responses[(league["api_id"], season)] = {
+                    "results": len(responses),
+                    "response": responses
+                }
+
+    return tables, fixture_responses
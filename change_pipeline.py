@@ -0,0 +1,386 @@
+import time
+
+from data_collection import (
+    supabase,
+    CURRENT_SEASON,
+    calculate_tactical_matchup,
+    create_enhanced_match,
+    load_prediction_model,
+    make_prediction
+)
+
+# Downstream stages in dependency order. Recomputing a stage also recomputes
+# every stage after it, so a queued fixture only needs its earliest stage.
+STAGES = ["matchup", "enhanced", "prediction"]
+
+# Seconds a fixture must stay quiet before it is processed, and the longest a
+# fixture may be held back while events keep arriving for it
+DEBOUNCE_SECONDS = 5.0
+MAX_DELAY_SECONDS = 30.0
+
+# Number of change events read from the database per poll
+CHANGE_BATCH_SIZE = 500
+
+# Attempts allowed for processing a fixture, and for resolving a change event,
+# before the failure is logged and the work is dropped
+MAX_PROCESS_ATTEMPTS = 3
+MAX_RESOLVE_ATTEMPTS = 3
+
+class ChangeQueue:
+    """
+    Coalescing, debounced queue of fixtures waiting for downstream recomputation
+
+    Each fixture remembers the change events that queued it, so events can be
+    acknowledged once none of their fixtures are pending or being processed.
+    """
+
+    def __init__(self, debounce_seconds=DEBOUNCE_SECONDS, max_delay_seconds=MAX_DELAY_SECONDS,
+                 max_attempts=MAX_PROCESS_ATTEMPTS):
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_attempts = max_attempts
+        # fixture_id -> [stage index, first seen, last seen, event ids, failed attempts]
+        self.pending = {}
+        # Entries returned by pop_ready that have not been completed or failed yet
+        self.in_flight = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def push(self, fixture_id, stage, now=None, event_id=None):
+        """
+        Queue a fixture from the given stage onwards, merging with any pending entry
+        """
+        now = time.time() if now is None else now
+        stage_index = STAGES.index(stage)
+        event_ids = set() if event_id is None else {event_id}
+
+        entry = self.pending.get(fixture_id)
+        if entry is None:
+            self.pending[fixture_id] = [stage_index, now, now, event_ids, 0]
+        else:
+            entry[0] = min(entry[0], stage_index)
+            entry[2] = now
+            entry[3] |= event_ids
+
+    def pop_ready(self, now=None):
+        """
+        Return (fixture_id, stage) pairs whose debounce window has elapsed
+
+        Returned fixtures stay in flight until complete or fail is called for them.
+        """
+        now = time.time() if now is None else now
+        ready = []
+
+        for fixture_id, entry in list(self.pending.items()):
+            stage_index, first_seen, last_seen = entry[:3]
+            if now - last_seen >= self.debounce_seconds or now - first_seen >= self.max_delay_seconds:
+                ready.append((fixture_id, STAGES[stage_index]))
+                self.in_flight[fixture_id] = self.pending.pop(fixture_id)
+
+        return ready
+
+    def flush(self):
+        """
+        Return every pending (fixture_id, stage) pair regardless of its debounce window
+        """
+        ready = [(fixture_id, STAGES[entry[0]]) for fixture_id, entry in self.pending.items()]
+        self.in_flight.update(self.pending)
+        self.pending.clear()
+        return ready
+
+    def complete(self, fixture_id):
+        """
+        Mark an in-flight fixture as processed
+        """
+        self.in_flight.pop(fixture_id, None)
+
+    def fail(self, fixture_id, now=None):
+        """
+        Put a failed in-flight fixture back on the queue, or drop it once it
+        has used up its attempts. Returns True if it was queued again.
+        """
+        now = time.time() if now is None else now
+        entry = self.in_flight.pop(fixture_id)
+        entry[4] += 1
+
+        if entry[4] >= self.max_attempts:
+            return False
+
+        pending = self.pending.get(fixture_id)
+        if pending is None:
+            entry[1] = entry[2] = now
+            self.pending[fixture_id] = entry
+        else:
+            # New events arrived for the fixture while it was being processed
+            pending[0] = min(pending[0], entry[0])
+            pending[3] |= entry[3]
+            pending[4] = entry[4]
+        return True
+
+    def event_ids(self):
+        """
+        Get the IDs of change events that still have pending or in-flight fixtures
+        """
+        event_ids = set()
+        for entry in list(self.pending.values()) + list(self.in_flight.values()):
+            event_ids |= entry[3]
+        return event_ids
+
+class LocalChangeFeed:
+    """
+    In-memory stand-in for the change_events table, used for local runs and tests
+    """
+
+    def __init__(self):
+        self.events = []
+        self.next_id = 1
+        self.read_ids = set()
+        self.resolve_attempts = {}
+
+    def publish(self, table_name, operation, record, old_record=None):
+        """
+        Publish a change event in the same shape as a change_events row
+        """
+        self.events.append({
+            "id": self.next_id,
+            "table_name": table_name,
+            "operation": operation,
+            "record": record,
+            "old_record": old_record
+        })
+        self.next_id += 1
+
+    def poll(self):
+        """
+        Return unacknowledged events that have not been read yet
+        """
+        events = [event for event in self.events if event["id"] not in self.read_ids]
+        self.read_ids.update(event["id"] for event in events)
+        return events
+
+    def rewind(self, event_id):
+        """
+        Re-deliver an event on the next poll
+        """
+        self.read_ids.discard(event_id)
+
+    def acknowledge(self, event_ids):
+        """
+        Discard the given events
+        """
+        self.events = [event for event in self.events if event["id"] not in event_ids]
+        self.read_ids -= event_ids
+        for event_id in event_ids:
+            self.resolve_attempts.pop(event_id, None)
+
+class SupabaseChangeFeed:
+    """
+    Change feed backed by the change_events table populated by database triggers
+
+    Every poll re-reads the table and skips events that were already read, and
+    only the IDs of processed events are deleted. Serial IDs can become visible
+    out of order across transactions, so neither reading nor deleting relies on
+    an ID cursor. Events that were read but not yet processed are read again
+    after a restart.
+    """
+
+    def __init__(self, batch_size=CHANGE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.read_ids = set()
+        self.resolve_attempts = {}
+
+    def poll(self):
+        """
+        Return the oldest unacknowledged change events that have not been read yet
+        """
+        # Read past the events that are already held so a full batch of them
+        # cannot hide newer events
+        limit = self.batch_size + len(self.read_ids)
+        rows = supabase.table("change_events").select("*").order("id").limit(limit).execute().data
+
+        events = [event for event in rows if event["id"] not in self.read_ids][:self.batch_size]
+        self.read_ids.update(event["id"] for event in events)
+        return events
+
+    def rewind(self, event_id):
+        """
+        Re-deliver an event on the next poll
+        """
+        self.read_ids.discard(event_id)
+
+    def acknowledge(self, event_ids):
+        """
+        Delete the given events
+        """
+        supabase.table("change_events").delete().in_("id", sorted(event_ids)).execute()
+        self.read_ids -= event_ids
+        for event_id in event_ids:
+            self.resolve_attempts.pop(event_id, None)
+
+def get_upcoming_team_fixture_ids(team_id):
+    """
+    Get the IDs of current season fixtures involving a team that have not started yet
+    """
+    home_fixtures = supabase.table("fixtures").select("id").eq("home_team_id", team_id).eq("season", CURRENT_SEASON).eq("status", "NS").execute().data
+    away_fixtures = supabase.table("fixtures").select("id").eq("away_team_id", team_id).eq("season", CURRENT_SEASON).eq("status", "NS").execute().data
+
+    return [fixture["id"] for fixture in home_fixtures + away_fixtures]
+
+def resolve_change_event(event):
+    """
+    Map a change event to the (fixture_id, stage) pairs it invalidates
+
+    Team level changes only fan out to upcoming fixtures, so matchups and
+    enhanced matches of played fixtures keep the features they were built with.
+    """
+    table_name = event["table_name"]
+    record = event["record"] or {}
+    old_record = event.get("old_record") or {}
+
+    if table_name == "fixtures":
+        # New fixtures need every stage; status or score changes only alter the
+        # result label and whether a prediction is still wanted
+        stage = "matchup" if event["operation"] == "INSERT" else "enhanced"
+        return [(record["id"], stage)]
+
+    if table_name == "team_stats":
+        # Enhanced matches are only built from current season stats
+        if record.get("season") != CURRENT_SEASON:
+            return []
+        return [(fixture_id, "enhanced") for fixture_id in get_upcoming_team_fixture_ids(record["team_id"])]
+
+    if table_name == "tactical_vectors":
+        manager = supabase.table("managers").select("team_id").eq("id", record["manager_id"]).execute().data
+        if not manager or manager[0]["team_id"] is None:
+            return []
+        return [(fixture_id, "matchup") for fixture_id in get_upcoming_team_fixture_ids(manager[0]["team_id"])]
+
+    if table_name == "managers":
+        # A manager moving clubs changes the matchups of both the old and the new team
+        team_ids = {team_id for team_id in (record.get("team_id"), old_record.get("team_id")) if team_id is not None}
+        return [(fixture_id, "matchup") for team_id in team_ids for fixture_id in get_upcoming_team_fixture_ids(team_id)]
+
+    print(f"Ignoring change event for unknown table: {table_name}")
+    return []
+
+def enqueue_change_event(queue, event, now=None):
+    """
+    Resolve a change event and push the affected fixtures onto the queue
+    """
+    for fixture_id, stage in resolve_change_event(event):
+        queue.push(fixture_id, stage, now, event.get("id"))
+
+class FixtureProcessor:
+    """
+    Recompute the downstream stages for individual fixtures
+    """
+
+    def __init__(self):
+        self.model = None
+        self.scaler = None
+
+    def process(self, fixture_id, stage):
+        """
+        Recompute the given stage and every later stage for one fixture
+        """
+        fixture = supabase.table("fixtures").select("*").eq("id", fixture_id).execute().data
+
+        if not fixture:
+            print(f"Fixture no longer exists, skipping ID: {fixture_id}")
+            return
+
+        fixture = fixture[0]
+        stage_index = STAGES.index(stage)
+
+        if stage_index <= STAGES.index("matchup"):
+            calculate_tactical_matchup(fixture, recompute=True)
+
+        if stage_index <= STAGES.index("enhanced"):
+            create_enhanced_match(fixture, recompute=True)
+
+        # Predictions are only kept for upcoming fixtures (status = NS for Not Started)
+        if fixture["status"] == "NS":
+            if self.model is None:
+                self.model, self.scaler = load_prediction_model()
+            make_prediction(fixture, self.model, self.scaler)
+
+def process_ready_changes(queue, processor, now=None):
+    """
+    Process every fixture whose debounce window has elapsed
+
+    Fixtures that fail are put back on the queue, so the change events they
+    came from are not acknowledged until they have been processed or have
+    used up their attempts.
+    """
+    ready = queue.pop_ready(now)
+
+    for fixture_id, stage in ready:
+        try:
+            processor.process(fixture_id, stage)
+            queue.complete(fixture_id)
+        except Exception as e:
+            print(f"Error processing fixture ID {fixture_id} from stage {stage}: {e}")
+            if not queue.fail(fixture_id, now):
+                print(f"Giving up on fixture ID {fixture_id} after {queue.max_attempts} attempts")
+
+    return len(ready)
+
+def consume_change_events(feed, queue, now=None, max_attempts=MAX_RESOLVE_ATTEMPTS):
+    """
+    Read new change events from the feed and push the affected fixtures onto the queue
+
+    An event that cannot be resolved is read again on the next poll, without
+    holding back later events, until it has used up its attempts.
+    """
+    for event in feed.poll():
+        try:
+            enqueue_change_event(queue, event, now)
+        except Exception as e:
+            print(f"Error resolving change event ID {event['id']}: {e}")
+            attempts = feed.resolve_attempts.get(event["id"], 0) + 1
+            feed.resolve_attempts[event["id"]] = attempts
+
+            if attempts < max_attempts:
+                feed.rewind(event["id"])
+            else:
+                print(f"Giving up on change event ID {event['id']} after {attempts} attempts")
+
+def acknowledge_processed_events(feed, queue):
+    """
+    Acknowledge every read change event whose fixtures have all been processed
+    """
+    event_ids = feed.read_ids - queue.event_ids()
+
+    if event_ids:
+        feed.acknowledge(event_ids)
+
+def run_change_pipeline(feed=None, queue=None, poll_interval=1.0, max_iterations=None):
+    """
+    Run the event-driven pipeline, recomputing only fixtures affected by changes
+    """
+    print("Starting event-driven data pipeline...")
+
+    feed = SupabaseChangeFeed() if feed is None else feed
+    queue = ChangeQueue() if queue is None else queue
+    processor = FixtureProcessor()
+
+    iteration = 0
+    while max_iterations is None or iteration < max_iterations:
+        iteration += 1
+
+        try:
+            consume_change_events(feed, queue)
+
+            processed = process_ready_changes(queue, processor)
+            if processed:
+                print(f"Processed {processed} fixtures, {len(queue)} pending")
+
+            acknowledge_processed_events(feed, queue)
+        except Exception as e:
+            print(f"Error in event-driven data pipeline: {e}")
+
+        time.sleep(poll_interval)
+
+if __name__ == "__main__":
+    run_change_pipeline()
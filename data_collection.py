@@ -382,265 +382,311 @@ def load_tactical_vectors():
     except Exception as e:
         print(f"Error loading tactical vectors: {e}")
 
+def calculate_tactical_matchup(fixture, recompute=False):
+    """
+    Calculate the tactical matchup for a single fixture
+    """
+    # Check if tactical matchup already exists
+    existing_matchup = supabase.table("tactical_matchups").select("*").eq("fixture_id", fixture["id"]).execute()
+
+    if len(existing_matchup.data) > 0 and not recompute:
+        return
+
+    # Get home and away team managers
+    home_team = supabase.table("teams").select("*").eq("id", fixture["home_team_id"]).execute().data[0]
+    away_team = supabase.table("teams").select("*").eq("id", fixture["away_team_id"]).execute().data[0]
+
+    home_manager = supabase.table("managers").select("*").eq("team_id", home_team["id"]).execute().data
+    away_manager = supabase.table("managers").select("*").eq("team_id", away_team["id"]).execute().data
+
+    if home_manager and away_manager:
+        home_manager = home_manager[0]
+        away_manager = away_manager[0]
+
+        # Get tactical vectors for both managers
+        home_vector = supabase.table("tactical_vectors").select("*").eq("manager_id", home_manager["id"]).execute().data
+        away_vector = supabase.table("tactical_vectors").select("*").eq("manager_id", away_manager["id"]).execute().data
+
+        if home_vector and away_vector:
+            home_vector = home_vector[0]
+            away_vector = away_vector[0]
+
+            # Calculate tactical matchups
+            # Convert vectors to numpy arrays for calculations
+            import numpy as np
+
+            home_array = np.array([
+                home_vector["pressing_intensity"],
+                home_vector["possession_control"],
+                home_vector["counter_attack_focus"],
+                home_vector["defensive_line_height"],
+                home_vector["defensive_aggression"],
+                home_vector["defensive_width"],
+                home_vector["offensive_width"],
+                home_vector["offensive_depth"],
+                home_vector["buildup_speed"],
+                home_vector["buildup_passing_directness"],
+                home_vector["buildup_initiation"],
+                home_vector["chance_creation_method"],
+                home_vector["defensive_organization"],
+                home_vector["wing_play_emphasis"]
+            ])
+
+            away_array = np.array([
+                away_vector["pressing_intensity"],
+                away_vector["possession_control"],
+                away_vector["counter_attack_focus"],
+                away_vector["defensive_line_height"],
+                away_vector["defensive_aggression"],
+                away_vector["defensive_width"],
+                away_vector["offensive_width"],
+                away_vector["offensive_depth"],
+                away_vector["buildup_speed"],
+                away_vector["buildup_passing_directness"],
+                away_vector["buildup_initiation"],
+                away_vector["chance_creation_method"],
+                away_vector["defensive_organization"],
+                away_vector["wing_play_emphasis"]
+            ])
+
+            # Calculate cosine similarity
+            cosine_similarity = np.dot(home_array, away_array) / (np.linalg.norm(home_array) * np.linalg.norm(away_array))
+
+            # Calculate euclidean distance
+            euclidean_distance = np.linalg.norm(home_array - away_array)
+
+            # Calculate specific tactical mismatches
+            pressing_mismatch = home_vector["pressing_intensity"] - away_vector["pressing_intensity"]
+            possession_defense_mismatch = home_vector["possession_control"] - away_vector["defensive_organization"]
+            counter_defense_mismatch = home_vector["counter_attack_focus"] - away_vector["defensive_line_height"]
+            buildup_pressing_mismatch = home_vector["buildup_initiation"] - away_vector["pressing_intensity"]
+            wing_width_mismatch = home_vector["wing_play_emphasis"] - away_vector["defensive_width"]
+
+            matchup_data = {
+                "fixture_id": fixture["id"],
+                "cosine_similarity": float(cosine_similarity),
+                "euclidean_distance": float(euclidean_distance),
+                "pressing_mismatch": float(pressing_mismatch),
+                "possession_defense_mismatch": float(possession_defense_mismatch),
+                "counter_defense_mismatch": float(counter_defense_mismatch),
+                "buildup_pressing_mismatch": float(buildup_pressing_mismatch),
+                "wing_width_mismatch": float(wing_width_mismatch)
+            }
+
+            if len(existing_matchup.data) == 0:
+                # Insert tactical matchup into database
+                supabase.table("tactical_matchups").insert(matchup_data).execute()
+
+                print(f"Added tactical matchup for fixture: {home_team['name']} vs {away_team['name']}")
+            else:
+                # Update tactical matchup
+                supabase.table("tactical_matchups").update(matchup_data).eq("fixture_id", fixture["id"]).execute()
+
+                print(f"Updated tactical matchup for fixture: {home_team['name']} vs {away_team['name']}")
+        else:
+            print(f"Missing tactical vectors for fixture: {home_team['name']} vs {away_team['name']}")
+    else:
+        print(f"Missing managers for fixture: {home_team['name']} vs {away_team['name']}")
+
 def calculate_tactical_matchups():
     """
     Calculate tactical matchups for fixtures
     """
     print("Calculating tactical matchups for fixtures...")
-    
+
     # Get fixtures that don't have tactical matchups yet
     fixtures = supabase.table("fixtures").select("*").execute().data
-    
+
     for fixture in fixtures:
-        # Check if tactical matchup already exists
-        existing_matchup = supabase.table("tactical_matchups").select("*").eq("fixture_id", fixture["id"]).execute()
-        
-        if len(existing_matchup.data) == 0:
-            # Get home and away team managers
-            home_team = supabase.table("teams").select("*").eq("id", fixture["home_team_id"]).execute().data[0]
-            away_team = supabase.table("teams").select("*").eq("id", fixture["away_team_id"]).execute().data[0]
-            
-            home_manager = supabase.table("managers").select("*").eq("team_id", home_team["id"]).execute().data
-            away_manager = supabase.table("managers").select("*").eq("team_id", away_team["id"]).execute().data
-            
-            if home_manager and away_manager:
-                home_manager = home_manager[0]
-                away_manager = away_manager[0]
-                
-                # Get tactical vectors for both managers
-                home_vector = supabase.table("tactical_vectors").select("*").eq("manager_id", home_manager["id"]).execute().data
-                away_vector = supabase.table("tactical_vectors").select("*").eq("manager_id", away_manager["id"]).execute().data
-                
-                if home_vector and away_vector:
-                    home_vector = home_vector[0]
-                    away_vector = away_vector[0]
-                    
-                    # Calculate tactical matchups
-                    # Convert vectors to numpy arrays for calculations
-                    import numpy as np
-                    
-                    home_array = np.array([
-                        home_vector["pressing_intensity"],
-                        home_vector["possession_control"],
-                        home_vector["counter_attack_focus"],
-                        home_vector["defensive_line_height"],
-                        home_vector["defensive_aggression"],
-                        home_vector["defensive_width"],
-                        home_vector["offensive_width"],
-                        home_vector["offensive_depth"],
-                        home_vector["buildup_speed"],
-                        home_vector["buildup_passing_directness"],
-                        home_vector["buildup_initiation"],
-                        home_vector["chance_creation_method"],
-                        home_vector["defensive_organization"],
-                        home_vector["wing_play_emphasis"]
-                    ])
-                    
-                    away_array = np.array([
-                        away_vector["pressing_intensity"],
-                        away_vector["possession_control"],
-                        away_vector["counter_attack_focus"],
-                        away_vector["defensive_line_height"],
-                        away_vector["defensive_aggression"],
-                        away_vector["defensive_width"],
-                        away_vector["offensive_width"],
-                        away_vector["offensive_depth"],
-                        away_vector["buildup_speed"],
-                        away_vector["buildup_passing_directness"],
-                        away_vector["buildup_initiation"],
-                        away_vector["chance_creation_method"],
-                        away_vector["defensive_organization"],
-                        away_vector["wing_play_emphasis"]
-                    ])
-                    
-                    # Calculate cosine similarity
-                    cosine_similarity = np.dot(home_array, away_array) / (np.linalg.norm(home_array) * np.linalg.norm(away_array))
-                    
-                    # Calculate euclidean distance
-                    euclidean_distance = np.linalg.norm(home_array - away_array)
-                    
-                    # Calculate specific tactical mismatches
-                    pressing_mismatch = home_vector["pressing_intensity"] - away_vector["pressing_intensity"]
-                    possession_defense_mismatch = home_vector["possession_control"] - away_vector["defensive_organization"]
-                    counter_defense_mismatch = home_vector["counter_attack_focus"] - away_vector["defensive_line_height"]
-                    buildup_pressing_mismatch = home_vector["buildup_initiation"] - away_vector["pressing_intensity"]
-                    wing_width_mismatch = home_vector["wing_play_emphasis"] - away_vector["defensive_width"]
-                    
-                    # Insert tactical matchup into database
-                    supabase.table("tactical_matchups").insert({
-                        "fixture_id": fixture["id"],
-                        "cosine_similarity": float(cosine_similarity),
-                        "euclidean_distance": float(euclidean_distance),
-                        "pressing_mismatch": float(pressing_mismatch),
-                        "possession_defense_mismatch": float(possession_defense_mismatch),
-                        "counter_defense_mismatch": float(counter_defense_mismatch),
-                        "buildup_pressing_mismatch": float(buildup_pressing_mismatch),
-                        "wing_width_mismatch": float(wing_width_mismatch)
-                    }).execute()
-                    
-                    print(f"Added tactical matchup for fixture: {home_team['name']} vs {away_team['name']}")
+        calculate_tactical_matchup(fixture)
+
+def create_enhanced_match(fixture, recompute=False):
+    """
+    Create the enhanced match with all features for a single fixture
+    """
+    # Check if enhanced match already exists
+    existing_enhanced = supabase.table("enhanced_matches").select("*").eq("fixture_id", fixture["id"]).execute()
+
+    if len(existing_enhanced.data) > 0 and not recompute:
+        return
+
+    # Get tactical matchup
+    tactical_matchup = supabase.table("tactical_matchups").select("*").eq("fixture_id", fixture["id"]).execute().data
+
+    if tactical_matchup:
+        tactical_matchup = tactical_matchup[0]
+
+        # Get team stats
+        home_team_stats = supabase.table("team_stats").select("*").eq("team_id", fixture["home_team_id"]).eq("season", CURRENT_SEASON).execute().data
+        away_team_stats = supabase.table("team_stats").select("*").eq("team_id", fixture["away_team_id"]).eq("season", CURRENT_SEASON).execute().data
+
+        if home_team_stats and away_team_stats:
+            home_team_stats = home_team_stats[0]
+            away_team_stats = away_team_stats[0]
+
+            # Calculate squad strength features
+            elo_difference = home_team_stats["elo_rating"] - away_team_stats["elo_rating"]
+            goal_diff_difference = (home_team_stats["goals_scored"] - home_team_stats["goals_conceded"]) - (away_team_stats["goals_scored"] - away_team_stats["goals_conceded"])
+            ppg_difference = home_team_stats["points_per_game"] - away_team_stats["points_per_game"]
+
+            # Determine result if match is finished
+            result = None
+            if fixture["status"] in ["FT", "AET", "PEN"]:
+                if fixture["home_score"] > fixture["away_score"]:
+                    result = 1  # Home win
+                elif fixture["home_score"] < fixture["away_score"]:
+                    result = -1  # Away win
                 else:
-                    print(f"Missing tactical vectors for fixture: {home_team['name']} vs {away_team['name']}")
+                    result = 0  # Draw
+
+            enhanced_data = {
+                "fixture_id": fixture["id"],
+                "cosine_similarity": tactical_matchup["cosine_similarity"],
+                "euclidean_distance": tactical_matchup["euclidean_distance"],
+                "pressing_mismatch": tactical_matchup["pressing_mismatch"],
+                "possession_defense_mismatch": tactical_matchup["possession_defense_mismatch"],
+                "counter_defense_mismatch": tactical_matchup["counter_defense_mismatch"],
+                "buildup_pressing_mismatch": tactical_matchup["buildup_pressing_mismatch"],
+                "wing_width_mismatch": tactical_matchup["wing_width_mismatch"],
+                "elo_difference": elo_difference,
+                "goal_diff_difference": goal_diff_difference,
+                "ppg_difference": ppg_difference,
+                "home_elo": home_team_stats["elo_rating"],
+                "away_elo": away_team_stats["elo_rating"],
+                "home_goals_scored": home_team_stats["goals_scored"],
+                "away_goals_scored": away_team_stats["goals_scored"],
+                "home_goals_conceded": home_team_stats["goals_conceded"],
+                "away_goals_conceded": away_team_stats["goals_conceded"],
+                "home_ppg": home_team_stats["points_per_game"],
+                "away_ppg": away_team_stats["points_per_game"],
+                "result": result
+            }
+
+            if len(existing_enhanced.data) == 0:
+                # Insert enhanced match into database
+                supabase.table("enhanced_matches").insert(enhanced_data).execute()
+
+                print(f"Added enhanced match for fixture ID: {fixture['id']}")
             else:
-                print(f"Missing managers for fixture: {home_team['name']} vs {away_team['name']}")
+                # Update enhanced match
+                supabase.table("enhanced_matches").update(enhanced_data).eq("fixture_id", fixture["id"]).execute()
+
+                print(f"Updated enhanced match for fixture ID: {fixture['id']}")
+        else:
+            print(f"Missing team stats for fixture ID: {fixture['id']}")
+    else:
+        print(f"Missing tactical matchup for fixture ID: {fixture['id']}")
 
 def create_enhanced_matches():
     """
     Create enhanced matches with all features for prediction
     """
     print("Creating enhanced matches with all features...")
-    
+
     # Get fixtures that have tactical matchups but not enhanced matches
     fixtures = supabase.table("fixtures").select("*").execute().data
-    
+
     for fixture in fixtures:
-        # Check if enhanced match already exists
-        existing_enhanced = supabase.table("enhanced_matches").select("*").eq("fixture_id", fixture["id"]).execute()
-        
-        if len(existing_enhanced.data) == 0:
-            # Get tactical matchup
-            tactical_matchup = supabase.table("tactical_matchups").select("*").eq("fixture_id", fixture["id"]).execute().data
-            
-            if tactical_matchup:
-                tactical_matchup = tactical_matchup[0]
-                
-                # Get team stats
-                home_team_stats = supabase.table("team_stats").select("*").eq("team_id", fixture["home_team_id"]).eq("season", CURRENT_SEASON).execute().data
-                away_team_stats = supabase.table("team_stats").select("*").eq("team_id", fixture["away_team_id"]).eq("season", CURRENT_SEASON).execute().data
-                
-                if home_team_stats and away_team_stats:
-                    home_team_stats = home_team_stats[0]
-                    away_team_stats = away_team_stats[0]
-                    
-                    # Calculate squad strength features
-                    elo_difference = home_team_stats["elo_rating"] - away_team_stats["elo_rating"]
-                    goal_diff_difference = (home_team_stats["goals_scored"] - home_team_stats["goals_conceded"]) - (away_team_stats["goals_scored"] - away_team_stats["goals_conceded"])
-                    ppg_difference = home_team_stats["points_per_game"] - away_team_stats["points_per_game"]
-                    
-                    # Determine result if match is finished
-                    result = None
-                    if fixture["status"] in ["FT", "AET", "PEN"]:
-                        if fixture["home_score"] > fixture["away_score"]:
-                            result = 1  # Home win
-                        elif fixture["home_score"] < fixture["away_score"]:
-                            result = -1  # Away win
-                        else:
-                            result = 0  # Draw
-                    
-                    # Insert enhanced match into database
-                    supabase.table("enhanced_matches").insert({
-                        "fixture_id": fixture["id"],
-                        "cosine_similarity": tactical_matchup["cosine_similarity"],
-                        "euclidean_distance": tactical_matchup["euclidean_distance"],
-                        "pressing_mismatch": tactical_matchup["pressing_mismatch"],
-                        "possession_defense_mismatch": tactical_matchup["possession_defense_mismatch"],
-                        "counter_defense_mismatch": tactical_matchup["counter_defense_mismatch"],
-                        "buildup_pressing_mismatch": tactical_matchup["buildup_pressing_mismatch"],
-                        "wing_width_mismatch": tactical_matchup["wing_width_mismatch"],
-                        "elo_difference": elo_difference,
-                        "goal_diff_difference": goal_diff_difference,
-                        "ppg_difference": ppg_difference,
-                        "home_elo": home_team_stats["elo_rating"],
-                        "away_elo": away_team_stats["elo_rating"],
-                        "home_goals_scored": home_team_stats["goals_scored"],
-                        "away_goals_scored": away_team_stats["goals_scored"],
-                        "home_goals_conceded": home_team_stats["goals_conceded"],
-                        "away_goals_conceded": away_team_stats["goals_conceded"],
-                        "home_ppg": home_team_stats["points_per_game"],
-                        "away_ppg": away_team_stats["points_per_game"],
-                        "result": result
-                    }).execute()
-                    
-                    print(f"Added enhanced match for fixture ID: {fixture['id']}")
-                else:
-                    print(f"Missing team stats for fixture ID: {fixture['id']}")
-            else:
-                print(f"Missing tactical matchup for fixture ID: {fixture['id']}")
+        create_enhanced_match(fixture)
+
+def load_prediction_model():
+    """
+    Load the trained model and scaler used for predictions
+    """
+    import pickle
+
+    with open("best_model.pkl", "rb") as f:
+        model = pickle.load(f)
+
+    with open("scaler.pkl", "rb") as f:
+        scaler = pickle.load(f)
+
+    return model, scaler
+
+def make_prediction(fixture, model, scaler):
+    """
+    Make and store the prediction for a single fixture
+    """
+    # Get enhanced match data
+    enhanced_match = supabase.table("enhanced_matches").select("*").eq("fixture_id", fixture["id"]).execute().data
+
+    if enhanced_match:
+        enhanced_match = enhanced_match[0]
+
+        # Prepare features for prediction
+        features = [
+            enhanced_match["cosine_similarity"],
+            enhanced_match["euclidean_distance"],
+            enhanced_match["pressing_mismatch"],
+            enhanced_match["possession_defense_mismatch"],
+            enhanced_match["counter_defense_mismatch"],
+            enhanced_match["buildup_pressing_mismatch"],
+            enhanced_match["wing_width_mismatch"],
+            enhanced_match["elo_difference"],
+            enhanced_match["goal_diff_difference"],
+            enhanced_match["ppg_difference"],
+            enhanced_match["home_elo"],
+            enhanced_match["away_elo"],
+            enhanced_match["home_goals_scored"],
+            enhanced_match["away_goals_scored"],
+            enhanced_match["home_goals_conceded"],
+            enhanced_match["away_goals_conceded"],
+            enhanced_match["home_ppg"],
+            enhanced_match["away_ppg"]
+        ]
+
+        # Scale features
+        features_scaled = scaler.transform([features])
+
+        # Make prediction (CatBoost returns one column per row for multiclass models)
+        prediction = model.predict(features_scaled).ravel()[0]
+
+        # Get probabilities
+        probabilities = model.predict_proba(features_scaled)[0]
+
+        # Check if prediction already exists
+        existing_prediction = supabase.table("predictions").select("*").eq("fixture_id", fixture["id"]).eq("model_name", "catboost").execute()
+
+        if len(existing_prediction.data) == 0:
+            # Insert prediction into database
+            supabase.table("predictions").insert({
+                "fixture_id": fixture["id"],
+                "model_name": "catboost",
+                "home_win_probability": float(probabilities[2]) if len(probabilities) > 2 else float(probabilities[1]),
+                "draw_probability": float(probabilities[1]) if len(probabilities) > 2 else float(probabilities[0]),
+                "away_win_probability": float(probabilities[0]) if len(probabilities) > 2 else 1.0 - float(probabilities[0]) - float(probabilities[1]),
+                "predicted_result": int(prediction)
+            }).execute()
+
+            print(f"Added prediction for fixture ID: {fixture['id']}")
+        else:
+            # Update prediction
+            supabase.table("predictions").update({
+                "home_win_probability": float(probabilities[2]) if len(probabilities) > 2 else float(probabilities[1]),
+                "draw_probability": float(probabilities[1]) if len(probabilities) > 2 else float(probabilities[0]),
+                "away_win_probability": float(probabilities[0]) if len(probabilities) > 2 else 1.0 - float(probabilities[0]) - float(probabilities[1]),
+                "predicted_result": int(prediction)
+            }).eq("fixture_id", fixture["id"]).eq("model_name", "catboost").execute()
+
+            print(f"Updated prediction for fixture ID: {fixture['id']}")
+    else:
+        print(f"Missing enhanced match data for fixture ID: {fixture['id']}")
 
 def make_predictions():
     """
     Make predictions for upcoming fixtures
     """
     print("Making predictions for upcoming fixtures...")
-    
-    # Load the trained model
-    import pickle
-    
+
     try:
-        with open("best_model.pkl", "rb") as f:
-            model = pickle.load(f)
-        
-        with open("scaler.pkl", "rb") as f:
-            scaler = pickle.load(f)
-        
+        # Load the trained model
+        model, scaler = load_prediction_model()
+
         # Get upcoming fixtures (status = NS for Not Started)
         upcoming_fixtures = supabase.table("fixtures").select("*").eq("status", "NS").execute().data
-        
+
         for fixture in upcoming_fixtures:
-            # Get enhanced match data
-            enhanced_match = supabase.table("enhanced_matches").select("*").eq("fixture_id", fixture["id"]).execute().data
-            
-            if enhanced_match:
-                enhanced_match = enhanced_match[0]
-                
-                # Prepare features for prediction
-                features = [
-                    enhanced_match["cosine_similarity"],
-                    enhanced_match["euclidean_distance"],
-                    enhanced_match["pressing_mismatch"],
-                    enhanced_match["possession_defense_mismatch"],
-                    enhanced_match["counter_defense_mismatch"],
-                    enhanced_match["buildup_pressing_mismatch"],
-                    enhanced_match["wing_width_mismatch"],
-                    enhanced_match["elo_difference"],
-                    enhanced_match["goal_diff_difference"],
-                    enhanced_match["ppg_difference"],
-                    enhanced_match["home_elo"],
-                    enhanced_match["away_elo"],
-                    enhanced_match["home_goals_scored"],
-                    enhanced_match["away_goals_scored"],
-                    enhanced_match["home_goals_conceded"],
-                    enhanced_match["away_goals_conceded"],
-                    enhanced_match["home_ppg"],
-                    enhanced_match["away_ppg"]
-                ]
-                
-                # Scale features
-                features_scaled = scaler.transform([features])
-                
-                # Make prediction
-                prediction = model.predict(features_scaled)[0]
-                
-                # Get probabilities
-                probabilities = model.predict_proba(features_scaled)[0]
-                
-                # Check if prediction already exists
-                existing_prediction = supabase.table("predictions").select("*").eq("fixture_id", fixture["id"]).eq("model_name", "catboost").execute()
-                
-                if len(existing_prediction.data) == 0:
-                    # Insert prediction into database
-                    supabase.table("predictions").insert({
-                        "fixture_id": fixture["id"],
-                        "model_name": "catboost",
-                        "home_win_probability": float(probabilities[2]) if len(probabilities) > 2 else float(probabilities[1]),
-                        "draw_probability": float(probabilities[1]) if len(probabilities) > 2 else float(probabilities[0]),
-                        "away_win_probability": float(probabilities[0]) if len(probabilities) > 2 else 1.0 - float(probabilities[0]) - float(probabilities[1]),
-                        "predicted_result": int(prediction)
-                    }).execute()
-                    
-                    print(f"Added prediction for fixture ID: {fixture['id']}")
-                else:
-                    # Update prediction
-                    supabase.table("predictions").update({
-                        "home_win_probability": float(probabilities[2]) if len(probabilities) > 2 else float(probabilities[1]),
-                        "draw_probability": float(probabilities[1]) if len(probabilities) > 2 else float(probabilities[0]),
-                        "away_win_probability": float(probabilities[0]) if len(probabilities) > 2 else 1.0 - float(probabilities[0]) - float(probabilities[1]),
-                        "predicted_result": int(prediction)
-                    }).eq("fixture_id", fixture["id"]).eq("model_name", "catboost").execute()
-                    
-                    print(f"Updated prediction for fixture ID: {fixture['id']}")
-            else:
-                print(f"Missing enhanced match data for fixture ID: {fixture['id']}")
+            make_prediction(fixture, model, scaler)
     except Exception as e:
         print(f"Error making predictions: {e}")
 
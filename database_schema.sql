@@ -207,3 +207,91 @@ FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_predictions_updated_at
 BEFORE UPDATE ON predictions
 FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Change events table used as the change-data-capture queue for the event-driven pipeline
+CREATE TABLE change_events (
+    id BIGSERIAL PRIMARY KEY,
+    table_name VARCHAR(50) NOT NULL,
+    operation VARCHAR(10) NOT NULL,
+    record JSONB,
+    old_record JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Create function for capturing row changes into the change events table
+CREATE OR REPLACE FUNCTION capture_change_event()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO change_events (table_name, operation, record, old_record)
+    VALUES (
+        TG_TABLE_NAME,
+        TG_OP,
+        to_jsonb(NEW),
+        CASE WHEN TG_OP = 'UPDATE' THEN to_jsonb(OLD) ELSE NULL END
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create triggers for capturing changes that affect downstream features and predictions
+-- Every update trigger compares the relevant columns rather than the whole row,
+-- as update_updated_at_column always changes updated_at. Updates therefore only
+-- enqueue an event when one of those columns actually changes, so the periodic
+-- batch re-writing identical values does not flood the queue
+CREATE TRIGGER capture_fixtures_insert
+AFTER INSERT ON fixtures
+FOR EACH ROW EXECUTE FUNCTION capture_change_event();
+
+CREATE TRIGGER capture_fixtures_update
+AFTER UPDATE ON fixtures
+FOR EACH ROW
+WHEN (OLD.status IS DISTINCT FROM NEW.status
+      OR OLD.home_score IS DISTINCT FROM NEW.home_score
+      OR OLD.away_score IS DISTINCT FROM NEW.away_score)
+EXECUTE FUNCTION capture_change_event();
+
+CREATE TRIGGER capture_team_stats_insert
+AFTER INSERT ON team_stats
+FOR EACH ROW EXECUTE FUNCTION capture_change_event();
+
+CREATE TRIGGER capture_team_stats_update
+AFTER UPDATE ON team_stats
+FOR EACH ROW
+WHEN (OLD.elo_rating IS DISTINCT FROM NEW.elo_rating
+      OR OLD.goals_scored IS DISTINCT FROM NEW.goals_scored
+      OR OLD.goals_conceded IS DISTINCT FROM NEW.goals_conceded
+      OR OLD.points_per_game IS DISTINCT FROM NEW.points_per_game)
+EXECUTE FUNCTION capture_change_event();
+
+CREATE TRIGGER capture_tactical_vectors_insert
+AFTER INSERT ON tactical_vectors
+FOR EACH ROW EXECUTE FUNCTION capture_change_event();
+
+CREATE TRIGGER capture_tactical_vectors_update
+AFTER UPDATE ON tactical_vectors
+FOR EACH ROW
+WHEN (OLD.pressing_intensity IS DISTINCT FROM NEW.pressing_intensity
+      OR OLD.possession_control IS DISTINCT FROM NEW.possession_control
+      OR OLD.counter_attack_focus IS DISTINCT FROM NEW.counter_attack_focus
+      OR OLD.defensive_line_height IS DISTINCT FROM NEW.defensive_line_height
+      OR OLD.defensive_aggression IS DISTINCT FROM NEW.defensive_aggression
+      OR OLD.defensive_width IS DISTINCT FROM NEW.defensive_width
+      OR OLD.offensive_width IS DISTINCT FROM NEW.offensive_width
+      OR OLD.offensive_depth IS DISTINCT FROM NEW.offensive_depth
+      OR OLD.buildup_speed IS DISTINCT FROM NEW.buildup_speed
+      OR OLD.buildup_passing_directness IS DISTINCT FROM NEW.buildup_passing_directness
+      OR OLD.buildup_initiation IS DISTINCT FROM NEW.buildup_initiation
+      OR OLD.chance_creation_method IS DISTINCT FROM NEW.chance_creation_method
+      OR OLD.defensive_organization IS DISTINCT FROM NEW.defensive_organization
+      OR OLD.wing_play_emphasis IS DISTINCT FROM NEW.wing_play_emphasis)
+EXECUTE FUNCTION capture_change_event();
+
+CREATE TRIGGER capture_managers_insert
+AFTER INSERT ON managers
+FOR EACH ROW EXECUTE FUNCTION capture_change_event();
+
+CREATE TRIGGER capture_managers_update
+AFTER UPDATE ON managers
+FOR EACH ROW
+WHEN (OLD.team_id IS DISTINCT FROM NEW.team_id)
+EXECUTE FUNCTION capture_change_event();
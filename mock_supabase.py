@@ -0,0 +1,166 @@
+"""
+In-memory stand-in for the Supabase client, used by the tests and benchmarks
+"""
+import operator
+
+class MockResponse:
+    """
+    Result of an executed query, mirroring the supabase-py APIResponse
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+class MockQuery:
+    """
+    Chainable query supporting the subset of the supabase-py builder used by the pipeline
+    """
+
+    def __init__(self, storage, table_name):
+        self.storage = storage
+        self.table_name = table_name
+        self.operation = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self.range_filters = []
+        self.order_column = None
+        self.limit_count = None
+
+    def select(self, columns="*"):
+        self.operation = "select"
+        self.columns = columns
+        return self
+
+    def insert(self, payload):
+        self.operation = "insert"
+        self.payload = payload
+        return self
+
+    def update(self, payload):
+        self.operation = "update"
+        self.payload = payload
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, [value]))
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, list(values)))
+        return self
+
+    def gt(self, column, value):
+        self.range_filters.append((column, operator.gt, value))
+        return self
+
+    def lte(self, column, value):
+        self.range_filters.append((column, operator.le, value))
+        return self
+
+    def order(self, column):
+        self.order_column = column
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def execute(self):
+        return MockResponse(self.storage.execute(self))
+
+class MockStorage:
+    """
+    In-memory stand-in for the Supabase client that counts round-trips
+
+    Equality filters are served from per-column hash indexes so the mock's own
+    lookup cost stays flat as the dataset grows and does not mask the
+    behaviour of the code being measured.
+    """
+
+    def __init__(self, tables=None):
+        self.tables = {}
+        self.indexes = {}
+        self.next_ids = {}
+        self.round_trips = 0
+        for table_name, rows in (tables or {}).items():
+            for row in rows:
+                self._insert_row(table_name, dict(row))
+
+    def table(self, table_name):
+        return MockQuery(self, table_name)
+
+    def _rows(self, table_name):
+        return self.tables.setdefault(table_name, [])
+
+    def _index(self, table_name, column):
+        table_indexes = self.indexes.setdefault(table_name, {})
+        if column not in table_indexes:
+            index = {}
+            for row in self._rows(table_name):
+                index.setdefault(row.get(column), []).append(row)
+            table_indexes[column] = index
+        return table_indexes[column]
+
+    def _insert_row(self, table_name, row):
+        if row.get("id") is None:
+            row["id"] = self.next_ids.get(table_name, 1)
+        self.next_ids[table_name] = max(self.next_ids.get(table_name, 1), row["id"] + 1)
+        self._rows(table_name).append(row)
+        for column, index in self.indexes.get(table_name, {}).items():
+            index.setdefault(row.get(column), []).append(row)
+        return row
+
+    def _match(self, query):
+        if not query.filters:
+            rows = list(self._rows(query.table_name))
+        else:
+            column, values = query.filters[0]
+            index = self._index(query.table_name, column)
+            rows = [row for value in values for row in index.get(value, [])]
+
+        for column, values in query.filters[1:]:
+            rows = [row for row in rows if row.get(column) in values]
+        for column, compare, value in query.range_filters:
+            rows = [row for row in rows if row.get(column) is not None and compare(row.get(column), value)]
+        return rows
+
+    def _project(self, row, columns):
+        if columns == "*":
+            return dict(row)
+        return {column.strip(): row.get(column.strip()) for column in columns.split(",")}
+
+    def execute(self, query):
+        self.round_trips += 1
+        table_name = query.table_name
+
+        if query.operation == "insert":
+            payload = query.payload if isinstance(query.payload, list) else [query.payload]
+            return [dict(self._insert_row(table_name, dict(row))) for row in payload]
+
+        rows = self._match(query)
+
+        if query.operation == "update":
+            # Drop indexes on updated columns; they are rebuilt on the next lookup
+            table_indexes = self.indexes.get(table_name, {})
+            for column in query.payload:
+                table_indexes.pop(column, None)
+            for row in rows:
+                row.update(query.payload)
+            return [dict(row) for row in rows]
+
+        if query.operation == "delete":
+            deleted = {id(row) for row in rows}
+            self.tables[table_name] = [row for row in self._rows(table_name) if id(row) not in deleted]
+            self.indexes.pop(table_name, None)
+            return [dict(row) for row in rows]
+
+        if query.order_column is not None:
+            rows = sorted(rows, key=lambda row: row.get(query.order_column))
+        if query.limit_count is not None:
+            rows = rows[:query.limit_count]
+        return [self._project(row, query.columns) for row in rows]
@@ -0,0 +1,92 @@
+import os
+import random
+
+import pytest
+
+import change_pipeline
+import data_collection
+from mock_supabase import MockStorage
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TACTICAL_FIELDS = [
+    "pressing_intensity",
+    "possession_control",
+    "counter_attack_focus",
+    "defensive_line_height",
+    "defensive_aggression",
+    "defensive_width",
+    "offensive_width",
+    "offensive_depth",
+    "buildup_speed",
+    "buildup_passing_directness",
+    "buildup_initiation",
+    "chance_creation_method",
+    "defensive_organization",
+    "wing_play_emphasis"
+]
+
+def build_tables(num_teams=4, seed=0):
+    """
+    Build one league with a finished past season and a half played current season
+    """
+    rng = random.Random(seed)
+    start_year = int(data_collection.CURRENT_SEASON.split("-")[0])
+    past_season = f"{start_year - 1}-{start_year}"
+    tables = {
+        "leagues": [{"id": 1, "name": "League 1", "country": "Country 1", "api_id": 1000}],
+        "teams": [],
+        "managers": [],
+        "tactical_vectors": [],
+        "team_stats": [],
+        "fixtures": []
+    }
+
+    for team_id in range(1, num_teams + 1):
+        tables["teams"].append({"id": team_id, "name": f"Team {team_id}", "league_id": 1, "api_id": 100000 + team_id})
+        tables["managers"].append({"id": team_id, "name": f"Manager {team_id}", "team_id": team_id, "api_id": 200000 + team_id})
+
+        vector = {"id": team_id, "manager_id": team_id}
+        vector.update({field: rng.uniform(0.0, 1.0) for field in TACTICAL_FIELDS})
+        tables["tactical_vectors"].append(vector)
+
+        tables["team_stats"].append({
+            "id": team_id,
+            "team_id": team_id,
+            "season": data_collection.CURRENT_SEASON,
+            "elo_rating": rng.uniform(1300.0, 1900.0),
+            "goals_scored": rng.randint(10, 90),
+            "goals_conceded": rng.randint(10, 90),
+            "points_per_game": rng.uniform(0.5, 2.5)
+        })
+
+    pairings = [(home, away) for home in range(1, num_teams + 1) for away in range(1, num_teams + 1) if home != away]
+    for season in (past_season, data_collection.CURRENT_SEASON):
+        played = len(pairings) if season == past_season else len(pairings) // 2
+        for index, (home, away) in enumerate(pairings):
+            finished = index < played
+            tables["fixtures"].append({
+                "id": len(tables["fixtures"]) + 1,
+                "home_team_id": home,
+                "away_team_id": away,
+                "league_id": 1,
+                "season": season,
+                "home_score": rng.randint(0, 4) if finished else None,
+                "away_score": rng.randint(0, 4) if finished else None,
+                "status": "FT" if finished else "NS",
+                "api_id": len(tables["fixtures"]) + 1
+            })
+
+    return tables
+
+@pytest.fixture
+def storage(monkeypatch):
+    """
+    Mock storage with one league of four teams over two seasons
+    """
+    storage = MockStorage(build_tables())
+    monkeypatch.setattr(data_collection, "supabase", storage)
+    monkeypatch.setattr(change_pipeline, "supabase", storage)
+    # make_prediction loads the model and scaler from the working directory
+    monkeypatch.chdir(REPO_ROOT)
+    return storage
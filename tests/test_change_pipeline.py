@@ -0,0 +1,289 @@
+import os
+import re
+
+import change_pipeline
+import data_collection
+from change_pipeline import (
+    ChangeQueue,
+    LocalChangeFeed,
+    SupabaseChangeFeed,
+    acknowledge_processed_events,
+    consume_change_events,
+    resolve_change_event,
+    run_change_pipeline
+)
+from conftest import REPO_ROOT, TACTICAL_FIELDS
+
+TRIGGER_PATTERN = re.compile(
+    r"CREATE TRIGGER (\w+)\s+AFTER (INSERT OR UPDATE|INSERT|UPDATE)\b.*? ON (\w+)\s+"
+    r"FOR EACH ROW\s+(?:WHEN \((.*?)\)\s+)?EXECUTE FUNCTION capture_change_event\(\);",
+    re.DOTALL
+)
+WHEN_TERM_PATTERN = re.compile(r"OLD\.(\w+) IS DISTINCT FROM NEW\.(\w+)")
+
+def load_capture_triggers():
+    """
+    Parse the change capture triggers into (operations, table, compared columns) tuples
+
+    Compared columns is None for triggers without a WHEN clause.
+    """
+    with open(os.path.join(REPO_ROOT, "database_schema.sql")) as f:
+        schema = f.read()
+
+    triggers = []
+    for _, operations, table_name, condition in TRIGGER_PATTERN.findall(schema):
+        columns = None
+        if condition:
+            terms = [term.strip() for term in condition.split(" OR ")]
+            columns = []
+            for term in terms:
+                match = WHEN_TERM_PATTERN.fullmatch(term)
+                assert match and match.group(1) == match.group(2), f"Unsupported WHEN term: {term}"
+                columns.append(match.group(1))
+        triggers.append((operations.split(" OR "), table_name, columns))
+    return triggers
+
+def capture_fires(table_name, old, new):
+    """
+    Whether an UPDATE from old to new would insert a change event
+    """
+    for operations, trigger_table, columns in load_capture_triggers():
+        if trigger_table != table_name or "UPDATE" not in operations:
+            continue
+        if columns is None or any(old.get(column) != new.get(column) for column in columns):
+            return True
+    return False
+
+def upcoming_fixture_ids(storage, team_id):
+    return sorted(
+        fixture["id"] for fixture in storage.tables["fixtures"]
+        if team_id in (fixture["home_team_id"], fixture["away_team_id"])
+        and fixture["season"] == data_collection.CURRENT_SEASON
+        and fixture["status"] == "NS"
+    )
+
+def test_push_coalesces_to_earliest_stage():
+    queue = ChangeQueue(5, 30)
+    queue.push(1, "prediction", now=0, event_id=7)
+    queue.push(1, "matchup", now=1, event_id=3)
+    queue.push(1, "enhanced", now=2, event_id=9)
+
+    assert len(queue) == 1
+    assert queue.event_ids() == {3, 7, 9}
+    assert queue.flush() == [(1, "matchup")]
+
+def test_pop_ready_waits_for_debounce():
+    queue = ChangeQueue(5, 30)
+    queue.push(1, "enhanced", now=0)
+    queue.push(2, "enhanced", now=0)
+    queue.push(2, "enhanced", now=3)
+
+    assert queue.pop_ready(now=4) == []
+    assert queue.pop_ready(now=5) == [(1, "enhanced")]
+    assert queue.pop_ready(now=8) == [(2, "enhanced")]
+    assert len(queue) == 0
+
+def test_pop_ready_releases_after_max_delay():
+    queue = ChangeQueue(5, 30)
+    for now in range(0, 30, 4):
+        queue.push(1, "enhanced", now=now)
+
+    assert queue.pop_ready(now=29) == []
+    assert queue.pop_ready(now=30) == [(1, "enhanced")]
+
+def test_in_flight_events_are_not_acknowledgeable():
+    queue = ChangeQueue(0, 0)
+    queue.push(1, "enhanced", now=0, event_id=4)
+    queue.pop_ready(now=0)
+
+    assert queue.event_ids() == {4}
+    queue.complete(1)
+    assert queue.event_ids() == set()
+
+def test_unchanged_rewrites_do_not_capture_events():
+    rows = {
+        "fixtures": {"id": 1, "status": "NS", "home_score": None, "away_score": None},
+        "team_stats": {"id": 1, "team_id": 1, "elo_rating": 1500.0, "goals_scored": 10, "goals_conceded": 5, "points_per_game": 2.0},
+        "tactical_vectors": dict({"id": 1, "manager_id": 1}, **{field: 0.5 for field in TACTICAL_FIELDS}),
+        "managers": {"id": 1, "name": "Manager 1", "team_id": 1}
+    }
+
+    triggers = load_capture_triggers()
+
+    for table_name, row in rows.items():
+        assert any(trigger_table == table_name and "UPDATE" in operations for operations, trigger_table, _ in triggers)
+        old = dict(row, updated_at="2024-08-01T00:00:00")
+        new = dict(row, updated_at="2024-08-02T00:00:00")
+        assert not capture_fires(table_name, old, new), table_name
+
+def test_tactical_vector_changes_capture_events():
+    old = dict({"id": 1, "manager_id": 1}, **{field: 0.5 for field in TACTICAL_FIELDS})
+
+    for field in TACTICAL_FIELDS:
+        assert capture_fires("tactical_vectors", old, dict(old, **{field: 0.6})), field
+
+def test_resolve_fixture_events(storage):
+    assert resolve_change_event({"table_name": "fixtures", "operation": "INSERT", "record": {"id": 5}}) == [(5, "matchup")]
+    assert resolve_change_event({"table_name": "fixtures", "operation": "UPDATE", "record": {"id": 5}}) == [(5, "enhanced")]
+
+def test_resolve_team_stats_only_touches_upcoming_fixtures(storage):
+    event = {"table_name": "team_stats", "operation": "UPDATE", "record": {"team_id": 1, "season": data_collection.CURRENT_SEASON}}
+    resolved = resolve_change_event(event)
+
+    assert sorted(fixture_id for fixture_id, _ in resolved) == upcoming_fixture_ids(storage, 1)
+    assert {stage for _, stage in resolved} == {"enhanced"}
+
+def test_resolve_ignores_past_season_team_stats(storage):
+    event = {"table_name": "team_stats", "operation": "INSERT", "record": {"team_id": 1, "season": "2000-2001"}}
+
+    assert resolve_change_event(event) == []
+
+def test_resolve_tactical_vector_uses_manager_team(storage):
+    event = {"table_name": "tactical_vectors", "operation": "UPDATE", "record": {"manager_id": 2}}
+    resolved = resolve_change_event(event)
+
+    assert sorted(fixture_id for fixture_id, _ in resolved) == upcoming_fixture_ids(storage, 2)
+    assert {stage for _, stage in resolved} == {"matchup"}
+
+def test_resolve_manager_move_touches_both_teams(storage):
+    event = {
+        "table_name": "managers",
+        "operation": "UPDATE",
+        "record": {"id": 1, "team_id": 2},
+        "old_record": {"id": 1, "team_id": 1}
+    }
+    resolved = {fixture_id for fixture_id, _ in resolve_change_event(event)}
+
+    assert resolved == set(upcoming_fixture_ids(storage, 1)) | set(upcoming_fixture_ids(storage, 2))
+
+def test_run_change_pipeline_processes_and_acknowledges(storage):
+    fixture_id = upcoming_fixture_ids(storage, 1)[0]
+    feed = LocalChangeFeed()
+    feed.publish("fixtures", "INSERT", {"id": fixture_id})
+
+    run_change_pipeline(feed, ChangeQueue(0, 0), poll_interval=0, max_iterations=1)
+
+    assert len(storage.tables["tactical_matchups"]) == 1
+    assert storage.tables["enhanced_matches"][0]["fixture_id"] == fixture_id
+    assert storage.tables["predictions"][0]["fixture_id"] == fixture_id
+    assert feed.events == []
+
+def test_finished_fixture_gets_result_label(storage):
+    fixture_id = upcoming_fixture_ids(storage, 1)[0]
+    feed = LocalChangeFeed()
+    feed.publish("fixtures", "INSERT", {"id": fixture_id})
+    run_change_pipeline(feed, ChangeQueue(0, 0), poll_interval=0, max_iterations=1)
+
+    storage.table("fixtures").update({"status": "FT", "home_score": 2, "away_score": 1}).eq("id", fixture_id).execute()
+    feed.publish("fixtures", "UPDATE", {"id": fixture_id})
+    run_change_pipeline(feed, ChangeQueue(0, 0), poll_interval=0, max_iterations=1)
+
+    assert storage.tables["enhanced_matches"][0]["result"] == 1
+
+def test_failed_fixture_is_retried_before_acknowledging(storage, monkeypatch):
+    fixture_id = upcoming_fixture_ids(storage, 1)[0]
+    feed = LocalChangeFeed()
+    queue = ChangeQueue(0, 0)
+    feed.publish("fixtures", "INSERT", {"id": fixture_id})
+
+    process = change_pipeline.FixtureProcessor.process
+
+    def fail(self, fixture_id, stage):
+        raise RuntimeError("storage unavailable")
+
+    monkeypatch.setattr(change_pipeline.FixtureProcessor, "process", fail)
+    run_change_pipeline(feed, queue, poll_interval=0, max_iterations=1)
+
+    assert len(feed.events) == 1
+    assert queue.event_ids() == {1}
+
+    monkeypatch.setattr(change_pipeline.FixtureProcessor, "process", process)
+    run_change_pipeline(feed, queue, poll_interval=0, max_iterations=1)
+
+    assert feed.events == []
+    assert storage.tables["predictions"][0]["fixture_id"] == fixture_id
+
+def test_failing_fixture_is_dropped_after_max_attempts(storage):
+    feed = LocalChangeFeed()
+    queue = ChangeQueue(0, 0, max_attempts=2)
+    # A fixture whose home team does not exist makes calculate_tactical_matchup raise
+    storage.table("fixtures").insert({"id": 999, "home_team_id": 999, "away_team_id": 1, "season": data_collection.CURRENT_SEASON, "status": "NS"}).execute()
+    feed.publish("fixtures", "INSERT", {"id": 999})
+    feed.publish("fixtures", "UPDATE", {"id": upcoming_fixture_ids(storage, 1)[0]})
+
+    run_change_pipeline(feed, queue, poll_interval=0, max_iterations=1)
+    assert [event["id"] for event in feed.events] == [1]
+
+    run_change_pipeline(feed, queue, poll_interval=0, max_iterations=1)
+    assert feed.events == []
+    assert len(queue) == 0
+
+def test_unresolved_event_does_not_block_later_events(storage, monkeypatch):
+    feed = LocalChangeFeed()
+    queue = ChangeQueue(0, 0)
+    feed.publish("fixtures", "UPDATE", {"id": 1})
+    feed.publish("fixtures", "UPDATE", {"id": 2})
+    calls = []
+
+    def resolve_once_failing(event):
+        calls.append(event["id"])
+        if len(calls) == 1:
+            raise RuntimeError("storage unavailable")
+        return [(event["record"]["id"], "enhanced")]
+
+    monkeypatch.setattr(change_pipeline, "resolve_change_event", resolve_once_failing)
+    consume_change_events(feed, queue, now=0)
+
+    assert calls == [1, 2]
+    assert queue.event_ids() == {2}
+    acknowledge_processed_events(feed, queue)
+    assert len(feed.events) == 2
+
+    consume_change_events(feed, queue, now=0)
+    assert calls == [1, 2, 1]
+    assert queue.event_ids() == {1, 2}
+
+def test_unresolvable_event_is_dropped_after_max_attempts(storage, monkeypatch):
+    feed = LocalChangeFeed()
+    queue = ChangeQueue(0, 0)
+    feed.publish("fixtures", "UPDATE", {"id": 1})
+
+    def always_failing(event):
+        raise RuntimeError("bad event")
+
+    monkeypatch.setattr(change_pipeline, "resolve_change_event", always_failing)
+
+    consume_change_events(feed, queue, now=0, max_attempts=2)
+    acknowledge_processed_events(feed, queue)
+    assert len(feed.events) == 1
+
+    consume_change_events(feed, queue, now=0, max_attempts=2)
+    acknowledge_processed_events(feed, queue)
+    assert feed.events == []
+
+def test_supabase_feed_reads_late_committed_events(storage):
+    # Event 2 commits after events 1 and 3 have already been read
+    for event_id in (1, 3):
+        storage.table("change_events").insert({"id": event_id, "table_name": "fixtures", "operation": "UPDATE", "record": {"id": event_id}}).execute()
+
+    feed = SupabaseChangeFeed(batch_size=10)
+    assert [event["id"] for event in feed.poll()] == [1, 3]
+
+    storage.table("change_events").insert({"id": 2, "table_name": "fixtures", "operation": "UPDATE", "record": {"id": 2}}).execute()
+    feed.acknowledge({1, 3})
+
+    assert [event["id"] for event in storage.tables["change_events"]] == [2]
+    assert [event["id"] for event in feed.poll()] == [2]
+
+def test_supabase_feed_skips_held_events(storage):
+    for fixture_id in (1, 2, 3):
+        storage.table("change_events").insert({"table_name": "fixtures", "operation": "UPDATE", "record": {"id": fixture_id}}).execute()
+
+    feed = SupabaseChangeFeed(batch_size=2)
+
+    assert [event["id"] for event in feed.poll()] == [1, 2]
+    assert [event["id"] for event in feed.poll()] == [3]
+    assert feed.poll() == []
+
+    feed.rewind(2)
+    assert [event["id"] for event in feed.poll()] == [2]